@@ -8,11 +8,11 @@ import os
 from pathlib import Path
 
 try:
-    from huggingface_hub import hf_hub_download
+    from huggingface_hub import snapshot_download
 except ImportError:
     print("Installing huggingface_hub...")
     os.system("pip install huggingface_hub")
-    from huggingface_hub import hf_hub_download
+    from huggingface_hub import snapshot_download
 
 
 def download_models(repo_id: str, output_dir: str = "models", token: str = None):
@@ -27,30 +27,22 @@ def download_models(repo_id: str, output_dir: str = "models", token: str = None)
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # List of common model files
-    model_files = [
-        "model.pkl",
-        "pytorch_model.pt",
-        "model_metadata.json",
-        "pytorch_model_metadata.json"
-    ]
-    
     print(f"Downloading models from {repo_id}...")
     
-    for filename in model_files:
-        try:
-            print(f"  Downloading {filename}...")
-            downloaded_path = hf_hub_download(
-                repo_id=repo_id,
-                filename=filename,
-                token=token,
-                cache_dir=None,
-                local_dir=output_dir,
-                local_dir_use_symlinks=False
-            )
-            print(f"  ✅ {filename} downloaded to {downloaded_path}")
-        except Exception as e:
-            print(f"  ⚠️  {filename} not found or error: {e}")
+    # snapshot_download fetches matching files concurrently and resumes
+    # partial downloads, so missing files no longer need per-file handling
+    try:
+        snapshot_download(
+            repo_id=repo_id,
+            token=token,
+            local_dir=output_dir,
+            local_dir_use_symlinks=False,
+            allow_patterns=["*.pkl", "*.pt", "*.json"],
+            max_workers=8
+        )
+    except Exception as e:
+        print(f"  ⚠️  Download failed: {e}")
+        return
     
     print(f"\n✅ Models downloaded to {output_dir}")
 
@@ -5,6 +5,7 @@ Upload trained models to Hugging Face Model Hub (Free Storage)
 
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -49,30 +50,25 @@ def upload_models(repo_id: str, models_dir: str = "models", token: str = None):
         print(f"No model files found in {models_dir}")
         return
     
-    print(f"\nUploading {len(model_files)} model files to {repo_id}...")
+    metadata_files = list(models_path.glob("*.json"))
+    all_files = model_files + metadata_files
     
-    for model_file in model_files:
-        print(f"  Uploading {model_file.name}...")
-        api.upload_file(
-            path_or_fileobj=str(model_file),
-            path_in_repo=model_file.name,
-            repo_id=repo_id,
-            repo_type="model",
-            token=token
-        )
-        print(f"  ✅ {model_file.name} uploaded successfully")
+    print(f"\nUploading {len(all_files)} files to {repo_id}...")
     
-    # Upload metadata files
-    metadata_files = list(models_path.glob("*.json"))
-    for metadata_file in metadata_files:
-        print(f"  Uploading {metadata_file.name}...")
+    def upload_one(file_path):
+        print(f"  Uploading {file_path.name}...")
         api.upload_file(
-            path_or_fileobj=str(metadata_file),
-            path_in_repo=metadata_file.name,
+            path_or_fileobj=str(file_path),
+            path_in_repo=file_path.name,
             repo_id=repo_id,
             repo_type="model",
             token=token
         )
+        print(f"  ✅ {file_path.name} uploaded successfully")
+    
+    # Uploads are network-bound, so run them concurrently
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(upload_one, all_files))
     
     print(f"\n✅ All models uploaded successfully!")
     print(f"📦 View your models at: https://huggingface.co/{repo_id}")
@@ -194,12 +194,11 @@ async def batch_predict(
     """
     try:
         start_time = time.time()
-        predictions = []
-        
-        for features in features_list:
-            prediction = predictor.predict(features)
-            predictions.append(prediction)
-        
+
+        # Single vectorized call - per-row predict pays sklearn's validation
+        # and dispatch overhead once per row instead of once per batch
+        predictions = predictor.batch_predict(features_list)
+
         batch_time = time.time() - start_time
         
         return {
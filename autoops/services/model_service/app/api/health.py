@@ -3,14 +3,22 @@ AutoOps Model Service - Health Check Endpoints
 Health and readiness check endpoints for the model service.
 """
 
+import asyncio
+import hashlib
+import logging
 import os
+import threading
 import time
-from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Dict, Any, Optional
+
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from pydantic import BaseModel
 
 from app.model.predict import ModelPredictor
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -41,38 +49,87 @@ class LivenessResponse(BaseModel):
 # Service start time for uptime calculation
 service_start_time = time.time()
 
+# Formatted timestamp cached per second - probes hit far more often than
+# the string actually changes
+_ts_cache = (0, "")
+
+
+def _utc_timestamp() -> str:
+    global _ts_cache
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(now)))
+    return _ts_cache[1]
+
+
+# Lazily constructed singleton - building a ModelPredictor per health ping
+# would reload model files on every probe
+_predictor_singleton: Optional[ModelPredictor] = None
+_predictor_lock = threading.Lock()
+
+
+# Static portion of the detailed status payload, built once - env vars
+# can't change after process start, so reading them per request is waste
+_STATUS_STATIC = {
+    "service": "AutoOps Model Service",
+    "version": "1.0.0",
+    "status": "healthy"
+}
+
+_STATIC_ENV = {
+    "python_version": os.sys.version,
+    "model_path": os.getenv("MODEL_PATH", "/app/models/model.pkl"),
+    "log_level": os.getenv("LOG_LEVEL", "INFO")
+}
+
+# The status payload is effectively constant per process - an ETag lets
+# polling clients get 304s instead of a fresh encode every few seconds
+_status_etag = hashlib.sha1(orjson.dumps(_STATUS_STATIC)).hexdigest()[:16]
+
+# Readiness snapshot cache - only one coroutine refreshes at a time
+_READY_TTL = 3.0
+_ready_cache = {"ts": 0.0, "payload": None}
+_ready_refresh_lock = asyncio.Lock()
 
-def get_model_predictor() -> ModelPredictor:
-    """Dependency to get the model predictor instance."""
-    try:
-        return ModelPredictor()
-    except Exception:
-        return None
 
+def get_model_predictor() -> Optional[ModelPredictor]:
+    """Dependency to get the shared model predictor instance."""
+    global _predictor_singleton
+    if _predictor_singleton is None:
+        with _predictor_lock:
+            if _predictor_singleton is None:
+                try:
+                    _predictor_singleton = ModelPredictor()
+                except Exception:
+                    return None
+    return _predictor_singleton
 
-@router.get("/", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+
+@router.get("/")
+async def health_check() -> Dict[str, Any]:
     """
     Basic health check endpoint.
     
     Returns:
         Health status and service information
     """
+    # Plain dict + orjson keeps the hot probe path free of Pydantic
+    # validation overhead
     uptime = time.time() - service_start_time
     
-    return HealthResponse(
-        status="healthy",
-        timestamp=time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
-        service="AutoOps Model Service",
-        version="1.0.0",
-        uptime=round(uptime, 2)
-    )
+    return {
+        "status": "healthy",
+        "timestamp": _utc_timestamp(),
+        "service": "AutoOps Model Service",
+        "version": "1.0.0",
+        "uptime": round(uptime, 2)
+    }
 
 
-@router.get("/ready", response_model=ReadinessResponse)
+@router.get("/ready", responses={200: {"model": ReadinessResponse}})
 async def readiness_check(
     predictor: ModelPredictor = Depends(get_model_predictor)
-) -> ReadinessResponse:
+) -> Dict[str, Any]:
     """
     Readiness check endpoint to verify service is ready to serve requests.
     
@@ -82,45 +139,59 @@ async def readiness_check(
     Returns:
         Readiness status and dependency information
     """
-    dependencies = {
-        "model_loaded": False,
-        "model_accessible": False,
-        "storage_accessible": True  # Assume storage is accessible
-    }
-    
-    model_loaded = False
-    model_version = "unknown"
-    
-    try:
-        if predictor is not None:
-            model_loaded = predictor.is_model_loaded()
-            if model_loaded:
-                model_version = predictor.get_model_version()
-                dependencies["model_loaded"] = True
-                dependencies["model_accessible"] = True
-    except Exception as e:
-        print(f"Model readiness check failed: {e}")
-    
-    # Check if all critical dependencies are ready
-    all_ready = all(dependencies.values())
-    status = "ready" if all_ready else "not_ready"
-    
-    if not all_ready:
-        raise HTTPException(
-            status_code=503,
-            detail="Service not ready - dependencies not available"
-        )
-    
-    return ReadinessResponse(
-        status=status,
-        model_loaded=model_loaded,
-        model_version=model_version,
-        dependencies=dependencies
-    )
+    # Serve a recent snapshot - readiness is polled every few seconds by
+    # the orchestrator and doesn't need to touch the model each time
+    now = time.monotonic()
+    if _ready_cache["payload"] is not None and now - _ready_cache["ts"] < _READY_TTL:
+        return _ready_cache["payload"]
+
+    async with _ready_refresh_lock:
+        now = time.monotonic()
+        if _ready_cache["payload"] is not None and now - _ready_cache["ts"] < _READY_TTL:
+            return _ready_cache["payload"]
+
+        dependencies = {
+            "model_loaded": False,
+            "model_accessible": False,
+            "storage_accessible": True  # Assume storage is accessible
+        }
+
+        model_loaded = False
+        model_version = "unknown"
+
+        try:
+            if predictor is not None:
+                model_loaded = await asyncio.to_thread(predictor.is_model_loaded)
+                if model_loaded:
+                    model_version = await asyncio.to_thread(predictor.get_model_version)
+                    dependencies["model_loaded"] = True
+                    dependencies["model_accessible"] = True
+        except Exception as e:
+            logger.warning("Model readiness check failed: %s", e)
+
+        # Check if all critical dependencies are ready
+        all_ready = all(dependencies.values())
+        status = "ready" if all_ready else "not_ready"
+
+        if not all_ready:
+            raise HTTPException(
+                status_code=503,
+                detail="Service not ready - dependencies not available"
+            )
+
+        payload = {
+            "status": status,
+            "model_loaded": model_loaded,
+            "model_version": model_version,
+            "dependencies": dependencies
+        }
+        _ready_cache["ts"] = now
+        _ready_cache["payload"] = payload
+        return payload
 
 
-@router.get("/live", response_model=LivenessResponse)
-async def liveness_check() -> LivenessResponse:
+@router.get("/live")
+async def liveness_check() -> Dict[str, Any]:
     """
     Liveness check endpoint to verify service is alive.
     
@@ -129,47 +200,50 @@ async def liveness_check() -> LivenessResponse:
     """
     uptime = time.time() - service_start_time
     
-    return LivenessResponse(
-        status="alive",
-        timestamp=time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
-        uptime=round(uptime, 2)
-    )
+    return {
+        "status": "alive",
+        "timestamp": _utc_timestamp(),
+        "uptime": round(uptime, 2)
+    }
 
 
 @router.get("/status")
 async def detailed_status(
+    request: Request,
     predictor: ModelPredictor = Depends(get_model_predictor)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Detailed status endpoint with comprehensive service information.
     
     Args:
+        request: Incoming request (for conditional-GET headers)
         predictor: Model predictor instance
         
     Returns:
         Detailed service status and metrics
     """
+    if request.headers.get("if-none-match") == _status_etag:
+        return Response(status_code=304)
+    
     uptime = time.time() - service_start_time
     
-    status = {
-        "service": "AutoOps Model Service",
-        "version": "1.0.0",
-        "status": "healthy",
+    status = dict(_STATUS_STATIC)
+    status.update({
         "uptime_seconds": round(uptime, 2),
-        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
-        "environment": {
-            "python_version": os.sys.version,
-            "model_path": os.getenv("MODEL_PATH", "/app/models/model.pkl"),
-            "log_level": os.getenv("LOG_LEVEL", "INFO")
-        }
-    }
+        "timestamp": _utc_timestamp(),
+        "environment": _STATIC_ENV
+    })
     
     # Add model information if available
     if predictor is not None:
         try:
-            model_info = predictor.get_model_info()
+            model_info = await asyncio.to_thread(predictor.get_model_info)
             status["model"] = model_info
         except Exception as e:
             status["model"] = {"error": str(e)}
     
-    return status
+    return Response(
+        orjson.dumps(status),
+        headers={"ETag": _status_etag, "Cache-Control": "max-age=30"},
+        media_type="application/json"
+    )
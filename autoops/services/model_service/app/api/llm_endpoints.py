@@ -3,41 +3,55 @@ AutoOps LLM API Endpoints
 REST API endpoints for LLM capabilities (text generation, chat, analysis).
 """
 
+import asyncio
 import time
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, Field
 
-from app.model.comprehensive_llm import ComprehensiveLLMManager, create_llm_for_task
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.model.comprehensive_llm import LLM_CONFIGS, ComprehensiveLLMManager, create_llm_for_task
 from app.utils.telemetry import record_prediction
 
 router = APIRouter()
 
-# Global LLM manager instance
-llm_manager = None
-
 
 class TextGenerationRequest(BaseModel):
     """Request model for text generation."""
+    model_config = ConfigDict(extra="ignore")
+
     prompt: str = Field(..., description="Input text prompt", example="Write a story about AI")
     max_tokens: int = Field(100, description="Maximum tokens to generate", example=100)
     temperature: float = Field(0.7, description="Sampling temperature (0.0-1.0)", example=0.7)
+    stream: bool = Field(False, description="Stream chunks as they are generated")
 
 
 class ChatRequest(BaseModel):
     """Request model for chat."""
+    model_config = ConfigDict(extra="ignore")
+
     message: str = Field(..., description="User message", example="Hello, how are you?")
     conversation_history: Optional[List[Dict]] = Field(None, description="Previous conversation")
+    session_id: Optional[str] = Field(
+        None,
+        description="Persistent chat session key; avoids resending history every turn"
+    )
 
 
 class TextAnalysisRequest(BaseModel):
     """Request model for text analysis."""
+    model_config = ConfigDict(extra="ignore")
+
     text: str = Field(..., description="Text to analyze", example="I love this product!")
     task: str = Field("sentiment", description="Analysis task", example="sentiment")
 
 
 class QuestionAnsweringRequest(BaseModel):
     """Request model for question answering."""
+    model_config = ConfigDict(extra="ignore")
+
     question: str = Field(..., description="Question to answer", example="What is AI?")
     context: Optional[str] = Field(None, description="Context for the question")
 
@@ -58,38 +72,119 @@ class AnalysisResponse(BaseModel):
     processing_time: float = Field(..., description="Processing time in seconds")
 
 
-def get_llm_manager(task: str = "chatbot") -> ComprehensiveLLMManager:
-    """Dependency to get the LLM manager instance."""
-    global llm_manager
+class GenerationBatcher:
+    """Coalesce concurrent generation requests into one batched model call.
     
-    if llm_manager is None:
-        try:
-            llm_manager = create_llm_for_task(task)
-            llm_manager.load_model()
-        except Exception as e:
-            print(f"Failed to initialize LLM manager: {e}")
-            # Try fallback
+    Requests arriving within ``max_wait`` seconds (or until
+    ``max_batch_size`` accumulate) are executed as a single
+    ``generate_text_batch`` call, which is substantially more
+    throughput-efficient than per-request generation.
+    """
+    
+    def __init__(self, max_batch_size: int = 16, max_wait: float = 0.02):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = []
+        # Guards the queue only - never held across a model call, so
+        # new requests keep enqueueing while a batch generates
+        self._lock = asyncio.Lock()
+        self._flush_handle = None
+
+    async def generate(self, llm: ComprehensiveLLMManager, request: "TextGenerationRequest") -> str:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = None
+        async with self._lock:
+            self._queue.append((llm, request, future))
+            if len(self._queue) >= self.max_batch_size:
+                batch, self._queue = self._queue, []
+            elif self._flush_handle is None:
+                self._flush_handle = loop.create_task(self._delayed_flush())
+        if batch:
+            await self._run_batch(batch)
+        return await future
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.max_wait)
+        async with self._lock:
+            batch, self._queue = self._queue, []
+            self._flush_handle = None
+        if batch:
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch):
+        # Batch only requests that share sampling parameters - merging
+        # them would silently generate at another caller's settings
+        groups = {}
+        for item in batch:
+            _, req, _ = item
+            groups.setdefault((req.temperature, req.max_tokens), []).append(item)
+
+        for (temperature, max_tokens), group in groups.items():
+            llm = group[0][0]
+            prompts = [req.prompt for _, req, _ in group]
             try:
-                llm_manager = ComprehensiveLLMManager(provider="huggingface")
-                llm_manager.load_model()
-            except Exception as e2:
-                print(f"Fallback also failed: {e2}")
-                llm_manager = None
+                results = await asyncio.to_thread(
+                    llm.generate_text_batch, prompts,
+                    max_tokens=max_tokens, temperature=temperature
+                )
+                for (_, _, future), result in zip(group, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, _, future in group:
+                    if not future.done():
+                        future.set_exception(ValueError(str(e)))
+
+
+generation_batcher = GenerationBatcher()
+
+
+# Guards the lazy fallback below; without it a cold burst of requests
+# would all race into create_llm_for_task and spawn parallel model loads
+_llm_init_lock = asyncio.Lock()
+
+
+async def get_llm_manager(request: Request) -> ComprehensiveLLMManager:
+    """Dependency returning the manager loaded during lifespan startup.
+    
+    If startup loading failed, one request at a time retries the
+    initialization off the event loop; the rest wait on the lock instead
+    of piling on duplicate loads.
+    """
+    manager = getattr(request.app.state, "llm_manager", None)
+    
+    if manager is None:
+        async with _llm_init_lock:
+            manager = getattr(request.app.state, "llm_manager", None)
+            if manager is None:
+                try:
+                    manager = await asyncio.to_thread(create_llm_for_task, "chatbot")
+                    await asyncio.to_thread(manager.load_model)
+                    request.app.state.llm_manager = manager
+                    # Refresh the cached identity set at startup - it
+                    # still says "unknown" from the failed lifespan load
+                    info = manager.get_model_info()
+                    request.app.state.llm_provider = info.get("provider", "unknown")
+                    request.app.state.llm_model_name = info.get("model_name", "unknown")
+                except Exception:
+                    manager = None
     
-    if llm_manager is None or not llm_manager.is_model_loaded():
+    if manager is None or not manager.is_model_loaded():
         raise HTTPException(
             status_code=503,
             detail="LLM service unavailable. Please check configuration."
         )
     
-    return llm_manager
+    return manager
 
 
-@router.post("/generate", response_model=LLMResponse)
+@router.post("/generate", responses={200: {"model": LLMResponse}})
 async def generate_text(
     request: TextGenerationRequest,
+    http_request: Request,
     llm: ComprehensiveLLMManager = Depends(get_llm_manager)
-) -> LLMResponse:
+) -> ORJSONResponse:
     """
     Generate text using LLM.
     
@@ -101,37 +196,44 @@ async def generate_text(
         Generated text response
     """
     start_time = time.time()
-    
+
     try:
-        # Generate text
+        if request.stream:
+            # Chunks reach the client at first-token latency; the sync
+            # generator is iterated off the event loop by Starlette
+            return StreamingResponse(
+                llm.generate_text_stream(
+                    request.prompt,
+                    max_tokens=request.max_tokens,
+                    temperature=request.temperature
+                ),
+                media_type="text/plain"
+            )
+
+        # Gemini requests coalesce in the manager's own async batcher and
+        # fire as one asyncio.gather burst; local models go through the
+        # thread-side batcher, which feeds the pipeline one batched call
         if llm.provider == "gemini":
-            result = llm.generate_text(
-                prompt=request.prompt,
+            result = await llm.generate_text_async(
+                request.prompt,
                 max_tokens=request.max_tokens,
                 temperature=request.temperature
             )
         else:
-            # Hugging Face uses different parameter names
-            result = llm.generate_text(
-                prompt=request.prompt,
-                max_length=request.max_tokens,
-                temperature=request.temperature
-            )
+            result = await generation_batcher.generate(llm, request)
         
         processing_time = time.time() - start_time
         
         # Record metrics
         record_prediction("llm_text_generation", processing_time)
         
-        # Get model info
-        model_info = llm.get_model_info()
-        
-        return LLMResponse(
-            result=result,
-            provider=model_info.get("provider", "unknown"),
-            model_name=model_info.get("model_name", "unknown"),
-            processing_time=processing_time
-        )
+        # Bare dict via orjson - skips the Pydantic output round-trip
+        return ORJSONResponse({
+            "result": result,
+            "provider": http_request.app.state.llm_provider,
+            "model_name": http_request.app.state.llm_model_name,
+            "processing_time": processing_time
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -140,11 +242,12 @@ async def generate_text(
         )
 
 
-@router.post("/chat", response_model=LLMResponse)
+@router.post("/chat", responses={200: {"model": LLMResponse}})
 async def chat(
     request: ChatRequest,
+    http_request: Request,
     llm: ComprehensiveLLMManager = Depends(get_llm_manager)
-) -> LLMResponse:
+) -> ORJSONResponse:
     """
     Chat with the LLM.
     
@@ -158,10 +261,11 @@ async def chat(
     start_time = time.time()
     
     try:
-        # Chat with LLM
-        result = llm.chat(
-            message=request.message,
-            conversation_history=request.conversation_history
+        # Chat with LLM - async client for Gemini, worker thread otherwise
+        result = await llm.chat_async(
+            request.message,
+            conversation_history=request.conversation_history,
+            session_id=request.session_id
         )
         
         processing_time = time.time() - start_time
@@ -169,15 +273,13 @@ async def chat(
         # Record metrics
         record_prediction("llm_chat", processing_time)
         
-        # Get model info
-        model_info = llm.get_model_info()
-        
-        return LLMResponse(
-            result=result,
-            provider=model_info.get("provider", "unknown"),
-            model_name=model_info.get("model_name", "unknown"),
-            processing_time=processing_time
-        )
+        # Bare dict via orjson - skips the Pydantic output round-trip
+        return ORJSONResponse({
+            "result": result,
+            "provider": http_request.app.state.llm_provider,
+            "model_name": http_request.app.state.llm_model_name,
+            "processing_time": processing_time
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -186,11 +288,12 @@ async def chat(
         )
 
 
-@router.post("/analyze", response_model=AnalysisResponse)
+@router.post("/analyze", responses={200: {"model": AnalysisResponse}})
 async def analyze_text(
     request: TextAnalysisRequest,
+    http_request: Request,
     llm: ComprehensiveLLMManager = Depends(get_llm_manager)
-) -> AnalysisResponse:
+) -> ORJSONResponse:
     """
     Analyze text for various tasks.
     
@@ -204,26 +307,20 @@ async def analyze_text(
     start_time = time.time()
     
     try:
-        # Analyze text
-        result = llm.analyze_text(
-            text=request.text,
-            task=request.task
-        )
+        # Analyze text - native async client for Gemini, thread otherwise
+        result = await llm.analyze_text_async(request.text, task=request.task)
         
         processing_time = time.time() - start_time
         
         # Record metrics
         record_prediction(f"llm_analysis_{request.task}", processing_time)
         
-        # Get model info
-        model_info = llm.get_model_info()
-        
-        return AnalysisResponse(
-            task=request.task,
-            result=result,
-            provider=model_info.get("provider", "unknown"),
-            processing_time=processing_time
-        )
+        return ORJSONResponse({
+            "task": request.task,
+            "result": result,
+            "provider": http_request.app.state.llm_provider,
+            "processing_time": processing_time
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -232,11 +329,12 @@ async def analyze_text(
         )
 
 
-@router.post("/qa", response_model=LLMResponse)
+@router.post("/qa", responses={200: {"model": LLMResponse}})
 async def answer_question(
     request: QuestionAnsweringRequest,
+    http_request: Request,
     llm: ComprehensiveLLMManager = Depends(get_llm_manager)
-) -> LLMResponse:
+) -> ORJSONResponse:
     """
     Answer a question using the LLM.
     
@@ -250,8 +348,8 @@ async def answer_question(
     start_time = time.time()
     
     try:
-        # Answer question
-        result = llm.answer_question(
+        # Answer question - native async client for Gemini, thread otherwise
+        result = await llm.answer_question_async(
             question=request.question,
             context=request.context
         )
@@ -261,15 +359,13 @@ async def answer_question(
         # Record metrics
         record_prediction("llm_qa", processing_time)
         
-        # Get model info
-        model_info = llm.get_model_info()
-        
-        return LLMResponse(
-            result=result,
-            provider=model_info.get("provider", "unknown"),
-            model_name=model_info.get("model_name", "unknown"),
-            processing_time=processing_time
-        )
+        # Bare dict via orjson - skips the Pydantic output round-trip
+        return ORJSONResponse({
+            "result": result,
+            "provider": http_request.app.state.llm_provider,
+            "model_name": http_request.app.state.llm_model_name,
+            "processing_time": processing_time
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -278,40 +374,42 @@ async def answer_question(
         )
 
 
+# Pure constants - encoded once at import so the endpoint is a byte copy
+_MODELS_PAYLOAD = orjson.dumps({
+    "available_tasks": list(LLM_CONFIGS.keys()),
+    "configurations": LLM_CONFIGS,
+    "providers": {
+        "gemini": {
+            "description": "Google Gemini API - High quality, free tier available",
+            "requires_api_key": True,
+            "get_key_url": "https://makersuite.google.com/app/apikey"
+        },
+        "huggingface": {
+            "description": "Hugging Face models - Free, runs locally",
+            "requires_api_key": False,
+            "note": "Smaller models for free deployment"
+        }
+    },
+    "setup_instructions": {
+        "gemini": "Set GEMINI_API_KEY environment variable",
+        "huggingface": "No setup required, models download automatically"
+    }
+})
+
+
 @router.get("/models")
-async def list_available_models() -> Dict[str, Any]:
+async def list_available_models() -> Response:
     """
     List available LLM models and configurations.
     
     Returns:
         Available models and their capabilities
     """
-    from app.model.comprehensive_llm import LLM_CONFIGS
-    
-    return {
-        "available_tasks": list(LLM_CONFIGS.keys()),
-        "configurations": LLM_CONFIGS,
-        "providers": {
-            "gemini": {
-                "description": "Google Gemini API - High quality, free tier available",
-                "requires_api_key": True,
-                "get_key_url": "https://makersuite.google.com/app/apikey"
-            },
-            "huggingface": {
-                "description": "Hugging Face models - Free, runs locally",
-                "requires_api_key": False,
-                "note": "Smaller models for free deployment"
-            }
-        },
-        "setup_instructions": {
-            "gemini": "Set GEMINI_API_KEY environment variable",
-            "huggingface": "No setup required, models download automatically"
-        }
-    }
+    return Response(_MODELS_PAYLOAD, media_type="application/json")
 
 
 @router.get("/status")
-async def llm_status() -> Dict[str, Any]:
+async def llm_status(request: Request) -> Dict[str, Any]:
     """
     Get LLM service status.
     
@@ -319,7 +417,7 @@ async def llm_status() -> Dict[str, Any]:
         Current LLM service status
     """
     try:
-        llm = get_llm_manager()
+        llm = await get_llm_manager(request)
         model_info = llm.get_model_info()
         
         return {
@@ -3,20 +3,28 @@ AutoOps Model Service - FastAPI Application
 Main entry point for the model serving service.
 """
 
+import asyncio
 import os
 import time
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
+import logging
+
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response
 
 from app.api.endpoints import router as api_router
+from app.api.health import _utc_timestamp, service_start_time
 from app.api.health import router as health_router
 from app.utils.telemetry import setup_telemetry, get_metrics
 
+logger = logging.getLogger(__name__)
+
 # Prometheus metrics
 REQUEST_COUNT = Counter(
     'http_requests_total', 
@@ -31,15 +39,51 @@ REQUEST_DURATION = Histogram(
 )
 
 
+async def _metrics_refresher(app: FastAPI):
+    """Re-encode the metrics exposition text once a second for scrapes."""
+    while True:
+        app.state.metrics_bytes = await asyncio.to_thread(generate_latest)
+        await asyncio.sleep(1.0)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown tasks."""
     # Startup
     setup_telemetry()
-    print("🚀 AutoOps Model Service started successfully!")
+
+    # Load the LLM once per process instead of on the first user request,
+    # which would otherwise eat the cold-start and 503 everyone behind it
+    app.state.llm_manager = None
+    try:
+        from app.model.comprehensive_llm import ComprehensiveLLMManager, create_llm_for_task
+        try:
+            app.state.llm_manager = create_llm_for_task(os.getenv("LLM_TASK", "chatbot"))
+            app.state.llm_manager.load_model()
+        except Exception as e:
+            logger.warning("LLM startup load failed: %s", e)
+            app.state.llm_manager = ComprehensiveLLMManager(provider="huggingface")
+            app.state.llm_manager.load_model()
+    except Exception as e:
+        logger.warning("LLM unavailable: %s", e)
+        app.state.llm_manager = None
+
+    # Provider and model name never change for a loaded model - resolve
+    # them once so endpoints don't rebuild model info per request
+    app.state.llm_provider = "unknown"
+    app.state.llm_model_name = "unknown"
+    if app.state.llm_manager is not None and app.state.llm_manager.is_model_loaded():
+        info = app.state.llm_manager.get_model_info()
+        app.state.llm_provider = info.get("provider", "unknown")
+        app.state.llm_model_name = info.get("model_name", "unknown")
+
+    metrics_task = asyncio.create_task(_metrics_refresher(app))
+
+    logger.info("AutoOps Model Service started successfully")
     yield
     # Shutdown
-    print("🛑 AutoOps Model Service shutting down...")
+    metrics_task.cancel()
+    logger.info("AutoOps Model Service shutting down")
 
 
 # Create FastAPI application
@@ -47,39 +91,50 @@ app = FastAPI(
     title="AutoOps Model Service",
     description="MLOps automation toolkit model serving API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
+# The wildcard entry previously made the allowlist moot; explicit origins
+# plus one compiled regex cover local dev and hosted frontends
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",  # Next.js dev
-        "http://localhost:3001",  # Alternative port
-        "https://*.netlify.app",  # Netlify deployments
-        "https://*.vercel.app",   # Vercel deployments
-        "*"  # Allow all for development (configure for production)
-    ],
+    allow_origins=os.getenv(
+        "CORS_ORIGINS",
+        "http://localhost:3000,http://localhost:3001"
+    ).split(","),
+    allow_origin_regex=r"https://.*\.(netlify|vercel)\.app",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
+# Liveness probes fire every few seconds; instrumenting them is pure overhead
+_UNINSTRUMENTED_PATHS = {"/health/live", "/health/"}
+
+
 @app.middleware("http")
 async def metrics_middleware(request: Request, call_next):
     """Middleware to collect Prometheus metrics."""
-    start_time = time.time()
-    
+    if request.url.path in _UNINSTRUMENTED_PATHS:
+        return await call_next(request)
+
+    # Monotonic integer clock - cheaper than walltime and immune to NTP skew
+    start_ns = time.monotonic_ns()
+
     # Process request
     response = await call_next(request)
-    
+
     # Calculate duration
-    duration = time.time() - start_time
+    duration = (time.monotonic_ns() - start_ns) / 1e9
     
-    # Extract metrics
+    # Label with the matched route template, not the raw URL - raw paths
+    # with IDs or scanner traffic would mint unbounded label sets
     method = request.method
-    endpoint = request.url.path
+    route = request.scope.get("route")
+    endpoint = getattr(route, "path", "unmatched")
     status_code = str(response.status_code)
     
     # Record metrics
@@ -90,9 +145,14 @@ async def metrics_middleware(request: Request, call_next):
 
 
 @app.get("/metrics")
-async def metrics():
+async def metrics(request: Request):
     """Prometheus metrics endpoint."""
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    # Serve the snapshot kept fresh by the background refresher; fall back
+    # to direct generation before the lifespan task has populated it
+    body = getattr(request.app.state, "metrics_bytes", None)
+    if body is None:
+        body = generate_latest()
+    return Response(body, media_type=CONTENT_TYPE_LATEST)
 
 
 # Include routers
@@ -103,15 +163,13 @@ app.include_router(api_router, prefix="/api/v1", tags=["api"])
 try:
     from app.api.llm_endpoints import router as llm_router
     app.include_router(llm_router, prefix="/api/v1/llm", tags=["llm"])
-    print("✅ LLM endpoints loaded")
+    logger.info("LLM endpoints loaded")
 except ImportError as e:
-    print(f"⚠️ LLM endpoints not available: {e}")
+    logger.warning("LLM endpoints not available: %s", e)
 
 
-@app.get("/")
-async def root():
-    """Root endpoint with service information."""
-    return {
+# Static service description - built and encoded once at import
+_ROOT_PAYLOAD = orjson.dumps({
         "service": "AutoOps AI-Powered Model Service",
         "version": "1.0.0",
         "status": "healthy",
@@ -141,7 +199,50 @@ async def root():
             "gemini": "Set GEMINI_API_KEY environment variable",
             "get_gemini_key": "https://makersuite.google.com/app/apikey"
         }
-    }
+    })
+
+
+@app.get("/")
+async def root():
+    """Root endpoint with service information."""
+    return Response(_ROOT_PAYLOAD, media_type="application/json")
+
+
+class LivenessShortCircuit:
+    """ASGI wrapper answering liveness probes before the middleware stack.
+    
+    A liveness probe only needs to prove the process responds; routing,
+    dependency resolution and middleware are all skippable overhead.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["path"] == "/health/live"
+            and scope["method"] == "GET"
+        ):
+            body = orjson.dumps({
+                "status": "alive",
+                "timestamp": _utc_timestamp(),
+                "uptime": round(time.time() - service_start_time, 2)
+            })
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+        await self.app(scope, receive, send)
+
+
+app = LivenessShortCircuit(app)
 
 
 if __name__ == "__main__":
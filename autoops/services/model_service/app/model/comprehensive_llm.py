@@ -3,12 +3,52 @@ AutoOps Comprehensive LLM Manager
 Unified interface for Gemini API, Hugging Face models, and other LLM providers.
 """
 
+import asyncio
+import functools
+import logging
 import os
+import re
+import time
+from types import MappingProxyType
 from typing import Any, Dict, Optional, List, Union
-from datetime import datetime
 
 from app.model.gemini_model import GeminiModelManager
 from app.model.llm_model import LLMModelManager
+from app.model.response_cache import ResponseCache, make_cache_key
+from app.model.vllm_model import VLLMModelManager, vllm_available
+
+logger = logging.getLogger(__name__)
+
+# Sampling above this temperature is intentionally stochastic - serving a
+# cached completion there would defeat the point of the high temperature
+_CACHEABLE_TEMPERATURE = 0.3
+
+# Local sentiment answers below this confidence defer to Gemini
+_LOCAL_SENTIMENT_THRESHOLD = 0.85
+
+# Compiled once - model names repeat, so task inference is a cached
+# single regex scan instead of five substring checks per construction.
+# Dict order encodes match priority.
+_TASK_RE = re.compile(r"(sentiment|qa|squad|summarization|bart|translation)", re.I)
+
+_TASK_BY_KEYWORD = {
+    "sentiment": "text-classification",
+    "qa": "question-answering",
+    "squad": "question-answering",
+    "summarization": "summarization",
+    "bart": "summarization",
+    "translation": "translation",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _infer_task_from_model(model_name: str) -> str:
+    """Infer the pipeline task from a model name."""
+    found = {match.lower() for match in _TASK_RE.findall(model_name)}
+    for keyword, task in _TASK_BY_KEYWORD.items():
+        if keyword in found:
+            return task
+    return "text-generation"
 
 
 class ComprehensiveLLMManager:
@@ -38,6 +78,17 @@ class ComprehensiveLLMManager:
         self.api_key = api_key
         self.active_manager = None
         self.metadata = {}
+        self._metadata_frozen = MappingProxyType(self.metadata)
+        self.response_cache = ResponseCache()
+        # In-flight deduplication: concurrent identical requests share
+        # one upstream call instead of fanning out duplicates
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Provider dispatch table, built once in _initialize_manager
+        self._dispatch: Dict[str, Any] = {}
+        # Lazily loaded local sentiment classifier (None = not yet tried,
+        # False = unavailable) plus hit counters for tuning the threshold
+        self._local_sentiment = None
+        self._local_sentiment_stats = {"local": 0, "fallback": 0}
         
         # Auto-detect best available provider
         if provider == "auto":
@@ -77,38 +128,153 @@ class ComprehensiveLLMManager:
                 
                 model_name = self.model_name or default_models.get("chat")
                 task = self._infer_task_from_model(model_name)
-                
-                self.active_manager = LLMModelManager(
-                    model_name=model_name,
-                    task=task
-                )
+
+                # Prefer the vLLM engine for generation models when a GPU
+                # and the package are present - its continuous batching
+                # beats the one-request-at-a-time transformers pipeline
+                if task == "text-generation" and vllm_available():
+                    self.active_manager = VLLMModelManager(
+                        model_name=model_name,
+                        task=task
+                    )
+                else:
+                    self.active_manager = LLMModelManager(
+                        model_name=model_name,
+                        task=task,
+                        quantization=os.getenv("AUTOOPS_QUANTIZATION")
+                    )
             
             elif self.provider == "openai":
                 self.active_manager = self._create_openai_manager()
             
             else:
                 raise ValueError(f"Unknown provider: {self.provider}")
-                
+
+            self._build_dispatch()
+
         except Exception as e:
-            print(f"Failed to initialize {self.provider} manager: {e}")
+            logger.exception("Failed to initialize %s manager: %s", self.provider, e)
             # Fallback to Hugging Face
             if self.provider != "huggingface":
-                print("Falling back to Hugging Face models...")
+                logger.info("Falling back to Hugging Face models...")
                 self.provider = "huggingface"
                 self._initialize_manager()
     
+    def _build_dispatch(self):
+        """Bind provider handlers once instead of branching per call."""
+        if self.provider == "gemini":
+            self._dispatch = {
+                "generate_text": self._generate_gemini,
+                "chat": self._chat_gemini,
+                "analyze_text": self._analyze_gemini,
+                "answer_question": self._qa_gemini,
+            }
+        elif self.provider == "huggingface":
+            self._dispatch = {
+                "generate_text": self._generate_hf,
+                "chat": self._chat_hf,
+                "analyze_text": self._analyze_hf,
+                "answer_question": self._qa_hf,
+            }
+        else:
+            self._dispatch = {}
+
+    # Provider handlers bound into the dispatch table
+
+    def _generate_gemini(self, prompt: str, **kwargs) -> str:
+        return self.active_manager.generate_text(prompt, **kwargs)
+
+    def _generate_hf(self, prompt: str, **kwargs) -> str:
+        results = self.active_manager.generate_text(prompt, **kwargs)
+        return results[0] if isinstance(results, list) else results
+
+    def _chat_gemini(self, message: str, **kwargs) -> str:
+        return self.active_manager.chat(message, **kwargs)
+
+    def _chat_hf(self, message: str, **kwargs) -> str:
+        # Use text generation for chat; session state is Gemini-only
+        kwargs.pop("session_id", None)
+        return self.generate_text(message, **kwargs)
+
+    def _analyze_gemini(self, text: str, task: str) -> Dict[str, Any]:
+        result = self.active_manager.analyze_text(text, task)
+        # If Gemini returns a string, wrap it in a dict
+        if isinstance(result, str):
+            return {"task": task, "result": result}
+        return result
+
+    def _analyze_hf(self, text: str, task: str) -> Dict[str, Any]:
+        if task == "sentiment":
+            return self.active_manager.classify_text(text)
+        # Use text generation for other tasks
+        prompt = f"Analyze this text for {task}: {text}"
+        return {"task": task, "result": self.generate_text(prompt, max_length=100)}
+
+    def _qa_gemini(self, question: str, context: Optional[str]) -> str:
+        return self.active_manager.answer_question(question, context)
+
+    def _qa_hf(self, question: str, context: Optional[str]) -> str:
+        if context:
+            result = self.active_manager.answer_question(question, context)
+            return result.get("answer", "No answer found")
+        return self.generate_text(f"Question: {question}\nAnswer:", max_length=100)
+
+    def _local_sentiment_label(self, text: str) -> Optional[str]:
+        """Try a local classifier before paying a Gemini round-trip.
+
+        A distilled sentiment model answers the >90%-confidence common
+        case in ~10ms on CPU; only low-confidence texts go upstream.
+        Opt-in via AUTOOPS_LOCAL_SENTIMENT=1 since the model costs a few
+        hundred MB of RAM - too much for the smallest deploy tiers.
+        """
+        if os.getenv("AUTOOPS_LOCAL_SENTIMENT") != "1":
+            return None
+
+        if self._local_sentiment is None:
+            try:
+                from transformers import pipeline
+                self._local_sentiment = pipeline(
+                    "text-classification",
+                    model="cardiffnlp/twitter-roberta-base-sentiment-latest",
+                    device=-1
+                )
+            except Exception:
+                self._local_sentiment = False
+        if not self._local_sentiment:
+            return None
+
+        try:
+            scored = self._local_sentiment(text)[0]
+        except Exception:
+            return None
+
+        label = str(scored.get("label", "")).lower()
+        if scored.get("score", 0.0) >= _LOCAL_SENTIMENT_THRESHOLD and label in (
+            "positive", "negative", "neutral"
+        ):
+            self._local_sentiment_stats["local"] += 1
+        else:
+            self._local_sentiment_stats["fallback"] += 1
+            label = None
+
+        total = sum(self._local_sentiment_stats.values())
+        self.metadata["local_hit_rate"] = round(
+            self._local_sentiment_stats["local"] / total, 3
+        )
+        return label
+
+    def _cache_scope(self, op: str) -> str:
+        """Namespace for semantic cache matches.
+
+        Identical text embeds identically no matter what was asked about
+        it, so matches must stay within the same provider/model/operation
+        (and task, for analysis).
+        """
+        return f"{self.provider}:{self.model_name or ''}:{op}"
+
     def _infer_task_from_model(self, model_name: str) -> str:
         """Infer the task type from model name."""
-        if "sentiment" in model_name.lower():
-            return "text-classification"
-        elif "qa" in model_name.lower() or "squad" in model_name.lower():
-            return "question-answering"
-        elif "summarization" in model_name.lower() or "bart" in model_name.lower():
-            return "summarization"
-        elif "translation" in model_name.lower():
-            return "translation"
-        else:
-            return "text-generation"
+        return _infer_task_from_model(model_name)
     
     def _create_openai_manager(self):
         """Create OpenAI manager (placeholder for future implementation)."""
@@ -126,9 +292,10 @@ class ComprehensiveLLMManager:
             self.metadata = {
                 "provider": self.provider,
                 "model_loaded": True,
-                "loaded_at": datetime.now().isoformat()
+                "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S")
             }
-        
+            self._metadata_frozen = MappingProxyType(self.metadata)
+
         return success
     
     def generate_text(self, prompt: str, **kwargs) -> str:
@@ -144,16 +311,154 @@ class ComprehensiveLLMManager:
         """
         if self.active_manager is None:
             raise ValueError("No LLM manager initialized")
-        
+
+        # Near-deterministic generations are safe to reuse; high-temperature
+        # requests bypass the cache entirely
+        cache_key = None
+        if kwargs.get("temperature", 0.7) <= _CACHEABLE_TEMPERATURE:
+            cache_key = make_cache_key(self.provider, self.model_name or "", prompt, **kwargs)
+            cached = self.response_cache.get(
+                cache_key, prompt=prompt, scope=self._cache_scope("generate")
+            )
+            if cached is not None:
+                return cached
+
+        handler = self._dispatch.get("generate_text")
+        if handler is None:
+            raise ValueError(f"Text generation not implemented for {self.provider}")
+        result = handler(prompt, **kwargs)
+
+        if cache_key is not None:
+            self.response_cache.set(
+                cache_key, result, prompt=prompt, scope=self._cache_scope("generate")
+            )
+        return result
+
+    async def _singleflight(self, key: str, factory):
+        """Run factory() once per key; concurrent callers await the leader.
+
+        Fifty users asking the same trending question should cost one
+        upstream call, not fifty.
+        """
+        existing = self._inflight.get(key)
+        if existing is not None:
+            return await existing
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await factory()
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved for follower-less failures
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def generate_text_async(self, prompt: str, **kwargs) -> str:
+        """
+        Generate text from an async caller without blocking the event loop.
+
+        Gemini requests route through the SDK's async client (and its
+        coalescing batcher); other providers run the sync path in a
+        worker thread. Caching rules match ``generate_text``.
+
+        Args:
+            prompt: Input text prompt
+            **kwargs: Provider-specific parameters
+
+        Returns:
+            Generated text
+        """
+        if self.provider != "gemini" or not hasattr(self.active_manager, "generate_text_async"):
+            return await asyncio.to_thread(self.generate_text, prompt, **kwargs)
+
+        cache_key = None
+        if kwargs.get("temperature", 0.7) <= _CACHEABLE_TEMPERATURE:
+            cache_key = make_cache_key(self.provider, self.model_name or "", prompt, **kwargs)
+            # Cache lookups can embed the prompt (and hit Redis), so they
+            # run in a worker thread rather than on the event loop
+            cached = await asyncio.to_thread(
+                self.response_cache.get, cache_key, prompt, self._cache_scope("generate")
+            )
+            if cached is not None:
+                return cached
+
+        if cache_key is not None:
+            # Deterministic generations dedupe in flight; high-temperature
+            # requests intentionally sample independently
+            result = await self._singleflight(
+                cache_key,
+                lambda: self.active_manager.generate_text_async(prompt, **kwargs)
+            )
+        else:
+            result = await self.active_manager.generate_text_async(prompt, **kwargs)
+
+        if cache_key is not None:
+            await asyncio.to_thread(
+                self.response_cache.set, cache_key, result, prompt,
+                self._cache_scope("generate")
+            )
+        return result
+
+    def generate_text_stream(self, prompt: str, **kwargs):
+        """
+        Generate text as a stream of chunks.
+
+        Gemini streams natively; providers without a streaming API yield
+        the complete generation as a single chunk so callers can consume
+        both the same way.
+
+        Args:
+            prompt: Input text prompt
+            **kwargs: Provider-specific parameters
+
+        Yields:
+            Generated text chunks
+        """
+        if self.active_manager is None:
+            raise ValueError("No LLM manager initialized")
+
         if self.provider == "gemini":
-            return self.active_manager.generate_text(prompt, **kwargs)
+            yield from self.active_manager.generate_text_stream(prompt, **kwargs)
+        else:
+            yield self.generate_text(prompt, **kwargs)
+
+    def generate_text_batch(
+        self,
+        prompts: List[str],
+        max_tokens: int = 100,
+        temperature: float = 0.7
+    ) -> List[str]:
+        """
+        Generate text for multiple prompts at once.
         
-        elif self.provider == "huggingface":
-            results = self.active_manager.generate_text(prompt, **kwargs)
-            return results[0] if isinstance(results, list) else results
+        Hugging Face pipelines accept lists natively and are far more
+        throughput-efficient batched; the Gemini API has no batch call,
+        so prompts are sent sequentially there.
         
-        else:
-            raise ValueError(f"Text generation not implemented for {self.provider}")
+        Args:
+            prompts: Input text prompts
+            max_tokens: Maximum tokens per generation
+            temperature: Sampling temperature
+            
+        Returns:
+            One generated string per prompt
+        """
+        if self.active_manager is None:
+            raise ValueError("No LLM manager initialized")
+        
+        if self.provider == "huggingface":
+            return self.active_manager.generate_text_batch(
+                prompts, max_length=max_tokens, temperature=temperature
+            )
+        
+        return [
+            self.generate_text(prompt, max_tokens=max_tokens, temperature=temperature)
+            for prompt in prompts
+        ]
     
     def chat(self, message: str, **kwargs) -> str:
         """
@@ -166,16 +471,68 @@ class ComprehensiveLLMManager:
         Returns:
             LLM response
         """
-        if self.provider == "gemini":
-            return self.active_manager.chat(message, **kwargs)
-        
-        elif self.provider == "huggingface":
-            # Use text generation for chat
-            return self.generate_text(message, **kwargs)
-        
-        else:
+        # Only cache history-free, low-temperature exchanges - a reply that
+        # depends on prior turns isn't reusable across conversations
+        cache_key = None
+        if (
+            not kwargs.get("conversation_history")
+            and not kwargs.get("session_id")
+            and kwargs.get("temperature", 0.7) <= _CACHEABLE_TEMPERATURE
+        ):
+            cache_key = make_cache_key(self.provider, self.model_name or "", message, op="chat", **kwargs)
+            cached = self.response_cache.get(
+                cache_key, prompt=message, scope=self._cache_scope("chat")
+            )
+            if cached is not None:
+                return cached
+
+        handler = self._dispatch.get("chat")
+        if handler is None:
             raise ValueError(f"Chat not implemented for {self.provider}")
-    
+        result = handler(message, **kwargs)
+
+        if cache_key is not None:
+            self.response_cache.set(
+                cache_key, result, prompt=message, scope=self._cache_scope("chat")
+            )
+        return result
+
+    async def chat_async(self, message: str, **kwargs) -> str:
+        """
+        Chat from an async caller without blocking the event loop.
+
+        Args:
+            message: User message
+            **kwargs: Provider-specific parameters
+
+        Returns:
+            LLM response
+        """
+        if self.provider != "gemini" or not hasattr(self.active_manager, "chat_async"):
+            return await asyncio.to_thread(self.chat, message, **kwargs)
+
+        cache_key = None
+        if (
+            not kwargs.get("conversation_history")
+            and not kwargs.get("session_id")
+            and kwargs.get("temperature", 0.7) <= _CACHEABLE_TEMPERATURE
+        ):
+            cache_key = make_cache_key(self.provider, self.model_name or "", message, op="chat", **kwargs)
+            cached = await asyncio.to_thread(
+                self.response_cache.get, cache_key, message, self._cache_scope("chat")
+            )
+            if cached is not None:
+                return cached
+
+        result = await self.active_manager.chat_async(message, **kwargs)
+
+        if cache_key is not None:
+            await asyncio.to_thread(
+                self.response_cache.set, cache_key, result, message,
+                self._cache_scope("chat")
+            )
+        return result
+
     def analyze_text(self, text: str, task: str = "sentiment") -> Dict[str, Any]:
         """
         Analyze text for various tasks.
@@ -187,25 +544,123 @@ class ComprehensiveLLMManager:
         Returns:
             Analysis results
         """
-        if self.provider == "gemini":
-            result = self.active_manager.analyze_text(text, task)
-            # If Gemini returns a string, wrap it in a dict
-            if isinstance(result, str):
-                return {"task": task, "result": result}
-            return result
-        
-        elif self.provider == "huggingface":
-            if task == "sentiment":
-                return self.active_manager.classify_text(text)
-            else:
-                # Use text generation for other tasks
-                prompt = f"Analyze this text for {task}: {text}"
-                result = self.generate_text(prompt, max_length=100)
-                return {"task": task, "result": result}
-        
-        else:
+        # Analysis is deterministic in intent, so every result is cacheable
+        cache_key = make_cache_key(self.provider, self.model_name or "", text, op="analyze", task=task)
+        scope = self._cache_scope(f"analyze:{task}")
+        cached = self.response_cache.get(cache_key, prompt=text, scope=scope)
+        if cached is not None:
+            return cached
+
+        if task == "sentiment" and self.provider == "gemini":
+            label = self._local_sentiment_label(text)
+            if label is not None:
+                result = {"task": task, "result": label}
+                self.response_cache.set(cache_key, result, prompt=text, scope=scope)
+                return result
+
+        handler = self._dispatch.get("analyze_text")
+        if handler is None:
             raise ValueError(f"Text analysis not implemented for {self.provider}")
+        result = handler(text, task)
+
+        self.response_cache.set(cache_key, result, prompt=text, scope=scope)
+        return result
     
+    async def analyze_text_async(self, text: str, task: str = "sentiment") -> Dict[str, Any]:
+        """
+        Analyze text from an async caller without blocking the event loop.
+
+        Args:
+            text: Text to analyze
+            task: Analysis task
+
+        Returns:
+            Analysis results
+        """
+        if self.provider != "gemini" or not hasattr(self.active_manager, "analyze_text_async"):
+            return await asyncio.to_thread(self.analyze_text, text, task)
+
+        cache_key = make_cache_key(self.provider, self.model_name or "", text, op="analyze", task=task)
+        scope = self._cache_scope(f"analyze:{task}")
+        cached = await asyncio.to_thread(
+            self.response_cache.get, cache_key, text, scope
+        )
+        if cached is not None:
+            return cached
+
+        if task == "sentiment":
+            label = await asyncio.to_thread(self._local_sentiment_label, text)
+            if label is not None:
+                result = {"task": task, "result": label}
+                await asyncio.to_thread(
+                    self.response_cache.set, cache_key, result, text, scope
+                )
+                return result
+
+        result = await self._singleflight(
+            cache_key,
+            lambda: self.active_manager.analyze_text_async(text, task)
+        )
+        if isinstance(result, str):
+            result = {"task": task, "result": result}
+
+        await asyncio.to_thread(
+            self.response_cache.set, cache_key, result, text, scope
+        )
+        return result
+
+    async def batch_analyze_text(
+        self,
+        texts: List[str],
+        task: str = "sentiment",
+        batch_size: int = 32
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze many texts at once.
+
+        Gemini packs windows of texts into single JSON-array prompts;
+        other providers analyze serially in a worker thread.
+
+        Args:
+            texts: Texts to analyze
+            task: Analysis task
+            batch_size: Items packed per Gemini prompt
+
+        Returns:
+            One analysis result per input text, in order
+        """
+        if self.provider == "gemini" and hasattr(self.active_manager, "batch_analyze_async"):
+            labels = await self.active_manager.batch_analyze_async(
+                texts, task, batch_size=batch_size
+            )
+            return [{"task": task, "result": label} for label in labels]
+
+        return await asyncio.to_thread(
+            lambda: [self.analyze_text(text, task) for text in texts]
+        )
+
+    async def answer_question_async(self, question: str, context: Optional[str] = None) -> str:
+        """
+        Answer a question from an async caller without blocking the event loop.
+
+        Args:
+            question: Question to answer
+            context: Optional context
+
+        Returns:
+            Answer
+        """
+        if self.provider == "gemini" and hasattr(self.active_manager, "answer_question_async"):
+            key = make_cache_key(
+                self.provider, self.model_name or "", question,
+                op="qa", context=context or ""
+            )
+            return await self._singleflight(
+                key,
+                lambda: self.active_manager.answer_question_async(question, context)
+            )
+        return await asyncio.to_thread(self.answer_question, question, context)
+
     def answer_question(self, question: str, context: Optional[str] = None) -> str:
         """
         Answer a question.
@@ -217,18 +672,10 @@ class ComprehensiveLLMManager:
         Returns:
             Answer
         """
-        if self.provider == "gemini":
-            return self.active_manager.answer_question(question, context)
-        
-        elif self.provider == "huggingface":
-            if context:
-                result = self.active_manager.answer_question(question, context)
-                return result.get("answer", "No answer found")
-            else:
-                return self.generate_text(f"Question: {question}\nAnswer:", max_length=100)
-        
-        else:
+        handler = self._dispatch.get("answer_question")
+        if handler is None:
             raise ValueError(f"Question answering not implemented for {self.provider}")
+        return handler(question, context)
     
     def is_model_loaded(self) -> bool:
         """Check if model is loaded."""
@@ -248,7 +695,7 @@ class ComprehensiveLLMManager:
         info.update({
             "provider": self.provider,
             "manager_type": "ComprehensiveLLM",
-            "metadata": self.metadata
+            "metadata": self._metadata_frozen
         })
         
         return info
@@ -5,17 +5,50 @@ Model loading, saving, and management utilities.
 
 import os
 import pickle
-import json
 from datetime import datetime
 from typing import Any, Dict, Optional, Union
 from pathlib import Path
 
+import joblib
 import numpy as np
+import orjson
 from sklearn.base import BaseEstimator
 from sklearn.dummy import DummyRegressor
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error, r2_score
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _rf_predict_kernel(X, feature, threshold, left, right, value, offsets):
+        """Walk every tree for every sample over flat SoA node arrays.
+
+        Trees are concatenated into single feature/threshold/child/value
+        arrays with per-tree root offsets; child indices are already
+        globalized, so traversal never leaves the flat arrays. prange
+        parallelizes over samples.
+        """
+        n_samples = X.shape[0]
+        n_trees = offsets.shape[0]
+        out = np.empty(n_samples)
+        for i in prange(n_samples):
+            acc = 0.0
+            for t in range(n_trees):
+                node = offsets[t]
+                while left[node] >= 0:
+                    if X[i, feature[node]] <= threshold[node]:
+                        node = left[node]
+                    else:
+                        node = right[node]
+                acc += value[node]
+            out[i] = acc / n_trees
+        return out
+
 
 class ModelManager:
     """Manages model loading, saving, and metadata operations."""
@@ -30,6 +63,8 @@ class ModelManager:
         self.model_path = Path(model_path)
         self.metadata_path = self.model_path.parent / "model_metadata.json"
         self.model: Optional[BaseEstimator] = None
+        self.onnx_session = None
+        self.forest_arrays = None
         self.metadata: Dict[str, Any] = {}
     
     def load_model(self) -> bool:
@@ -44,12 +79,23 @@ class ModelManager:
                 print(f"Model file not found at {self.model_path}")
                 return False
             
-            with open(self.model_path, 'rb') as f:
-                self.model = pickle.load(f)
-            
+            # Memory-map the estimator's arrays so pages load on demand
+            # and are shared between workers instead of copied per
+            # process. Files written by older releases are plain pickle,
+            # so fall back to a full in-heap load for those.
+            try:
+                self.model = joblib.load(self.model_path, mmap_mode='r')
+            except Exception:
+                with open(self.model_path, 'rb') as f:
+                    self.model = pickle.load(f)
+
             # Load metadata if available
             self._load_metadata()
-            
+
+            # Compile a fast inference path when the tooling is present
+            self._init_onnx_session()
+            self._init_numba_forest()
+
             print(f"Model loaded successfully from {self.model_path}")
             return True
             
@@ -72,10 +118,11 @@ class ModelManager:
             # Ensure directory exists
             self.model_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Save model
-            with open(self.model_path, 'wb') as f:
-                pickle.dump(model, f)
-            
+            # Save model - uncompressed joblib keeps ndarray buffers raw
+            # on disk so load_model can memory-map them back
+            joblib.dump(model, self.model_path, compress=0,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
             # Save metadata
             if metadata is None:
                 metadata = {}
@@ -95,6 +142,98 @@ class ModelManager:
             print(f"Failed to save model: {e}")
             return False
     
+    def _init_onnx_session(self) -> None:
+        """Convert the loaded estimator to an ONNX Runtime session.
+
+        sklearn's RandomForest predict walks the trees through Python
+        dispatch per estimator; the ONNX graph runs the same traversal
+        as vectorized C with all graph optimizations on. The session is
+        purely additive - predictors fall back to model.predict when
+        onnxruntime/skl2onnx aren't installed or conversion fails.
+        """
+        self.onnx_session = None
+        try:
+            import onnxruntime
+            from skl2onnx import convert_sklearn
+            from skl2onnx.common.data_types import FloatTensorType
+        except ImportError:
+            return
+
+        try:
+            n_features = getattr(self.model, "n_features_in_", None)
+            if n_features is None:
+                return
+
+            onnx_model = convert_sklearn(
+                self.model,
+                initial_types=[("X", FloatTensorType([None, int(n_features)]))]
+            )
+            options = onnxruntime.SessionOptions()
+            options.graph_optimization_level = (
+                onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            )
+            self.onnx_session = onnxruntime.InferenceSession(
+                onnx_model.SerializeToString(),
+                sess_options=options,
+                providers=["CPUExecutionProvider"]
+            )
+            print("ONNX Runtime inference session ready")
+
+        except Exception as e:
+            print(f"ONNX acceleration unavailable: {e}")
+            self.onnx_session = None
+
+    def _init_numba_forest(self) -> None:
+        """Extract RandomForest node arrays for the Numba kernel.
+
+        Covers CPU hosts without onnxruntime: the trees' SoA node
+        attributes are concatenated into flat global arrays once at
+        load, and prediction walks them in a JIT-compiled parallel
+        loop instead of sklearn's per-estimator Python dispatch.
+        """
+        self.forest_arrays = None
+        if njit is None or self.onnx_session is not None:
+            return
+        if not isinstance(self.model, RandomForestRegressor):
+            return
+
+        try:
+            features, thresholds, lefts, rights, values, offsets = [], [], [], [], [], []
+            base = 0
+            for estimator in self.model.estimators_:
+                tree = estimator.tree_
+                offsets.append(base)
+                features.append(tree.feature)
+                thresholds.append(tree.threshold)
+                # Globalize child indices; leaves stay -1
+                lefts.append(np.where(tree.children_left < 0, -1, tree.children_left + base))
+                rights.append(np.where(tree.children_right < 0, -1, tree.children_right + base))
+                values.append(tree.value[:, 0, 0])
+                base += tree.node_count
+
+            self.forest_arrays = (
+                np.concatenate(features).astype(np.int64),
+                np.concatenate(thresholds).astype(np.float64),
+                np.concatenate(lefts).astype(np.int64),
+                np.concatenate(rights).astype(np.int64),
+                np.concatenate(values).astype(np.float64),
+                np.asarray(offsets, dtype=np.int64)
+            )
+            print("Numba forest kernel ready")
+
+        except Exception as e:
+            print(f"Numba forest kernel unavailable: {e}")
+            self.forest_arrays = None
+
+    def predict_forest(self, features_array: np.ndarray) -> np.ndarray:
+        """Predict via the JIT tree-walk kernel.
+
+        Only callable when _init_numba_forest populated forest_arrays.
+        """
+        feature, threshold, left, right, value, offsets = self.forest_arrays
+        X = np.ascontiguousarray(features_array, dtype=np.float64)
+        return _rf_predict_kernel(X, feature, threshold, left, right, value, offsets)
+
     def get_model(self) -> Optional[BaseEstimator]:
         """
         Get the loaded model.
@@ -201,8 +340,7 @@ class ModelManager:
         """Load model metadata from file."""
         try:
             if self.metadata_path.exists():
-                with open(self.metadata_path, 'r') as f:
-                    self.metadata = json.load(f)
+                self.metadata = orjson.loads(self.metadata_path.read_bytes())
         except Exception as e:
             print(f"Failed to load metadata: {e}")
             self.metadata = {}
@@ -210,8 +348,9 @@ class ModelManager:
     def _save_metadata(self, metadata: Dict[str, Any]) -> None:
         """Save model metadata to file."""
         try:
-            with open(self.metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            self.metadata_path.write_bytes(orjson.dumps(
+                metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            ))
             self.metadata = metadata
         except Exception as e:
             print(f"Failed to save metadata: {e}")
@@ -0,0 +1,145 @@
+"""
+AutoOps LLM Response Cache
+Two-tier caching for LLM completions: an exact-key LRU store plus an
+optional semantic store that matches paraphrased prompts by embedding
+similarity. Optionally backed by Redis for cross-process sharing.
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+def make_cache_key(provider: str, model_name: str, prompt: str, **params) -> str:
+    """Build a stable digest for a (provider, model, prompt, params) tuple."""
+    payload = {
+        "p": provider,
+        "m": model_name,
+        "prompt": prompt.strip().lower(),
+    }
+    payload.update(params)
+    return hashlib.blake2b(
+        json.dumps(payload, sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+
+
+class ResponseCache:
+    """Caches LLM responses with exact and semantic lookup tiers.
+
+    Exact lookups hash the full prompt and sampling parameters; semantic
+    lookups embed the prompt with a sentence transformer and accept the
+    closest stored prompt above a cosine-similarity threshold. Semantic
+    entries live in per-scope namespaces (operation/task/model), since
+    the same text embeds identically regardless of what was asked about
+    it - without the scope, a cached sentiment result would answer a
+    summary request. The semantic tier is skipped when
+    sentence-transformers is unavailable.
+    """
+
+    def __init__(self, maxsize: int = 1024, semantic_threshold: float = 0.92):
+        self.maxsize = maxsize
+        self.semantic_threshold = semantic_threshold
+        self._exact = OrderedDict()
+        self._embedder = None
+        # scope -> {"embeddings": ndarray, "values": list}
+        self._semantic = {}
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+        redis_url = os.getenv("REDIS_URL")
+        self._redis = (
+            redis.Redis.from_url(redis_url, decode_responses=True)
+            if (redis is not None and redis_url) else None
+        )
+        self._redis_ttl = int(os.getenv("LLM_CACHE_TTL", "3600"))
+
+    def _get_embedder(self):
+        if self._embedder is None and SentenceTransformer is not None:
+            try:
+                self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
+            except Exception:
+                self._embedder = None
+        return self._embedder
+
+    def _embed(self, prompt: str) -> Optional[np.ndarray]:
+        embedder = self._get_embedder()
+        if embedder is None:
+            return None
+        vector = embedder.encode(prompt, convert_to_numpy=True)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, key: str, prompt: Optional[str] = None, scope: str = "") -> Optional[Any]:
+        """Look up a response: exact key first, then Redis, then semantic.
+
+        Semantic matching only considers entries stored under the same
+        scope, so results never leak across operations or tasks.
+        """
+        if key in self._exact:
+            self._exact.move_to_end(key)
+            self.stats["exact_hits"] += 1
+            return self._exact[key]
+
+        if self._redis is not None:
+            try:
+                cached = self._redis.get("llm:" + key)
+            except Exception:
+                cached = None
+            if cached is not None:
+                self.stats["exact_hits"] += 1
+                return cached
+
+        store = self._semantic.get(scope)
+        if prompt is not None and store is not None and len(store["values"]):
+            vector = self._embed(prompt)
+            if vector is not None:
+                scores = store["embeddings"] @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.semantic_threshold:
+                    self.stats["semantic_hits"] += 1
+                    return store["values"][best]
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: Any, prompt: Optional[str] = None, scope: str = ""):
+        """Store a response in all available tiers."""
+        self._exact[key] = value
+        self._exact.move_to_end(key)
+        while len(self._exact) > self.maxsize:
+            self._exact.popitem(last=False)
+
+        if self._redis is not None and isinstance(value, str):
+            try:
+                self._redis.setex("llm:" + key, self._redis_ttl, value)
+            except Exception:
+                pass
+
+        if prompt is not None:
+            vector = self._embed(prompt)
+            if vector is not None:
+                store = self._semantic.setdefault(
+                    scope, {"embeddings": None, "values": []}
+                )
+                if store["embeddings"] is None:
+                    store["embeddings"] = vector.reshape(1, -1)
+                else:
+                    store["embeddings"] = np.vstack([store["embeddings"], vector])
+                store["values"].append(value)
+                # Bound each scope the same way as the exact tier
+                if len(store["values"]) > self.maxsize:
+                    store["embeddings"] = store["embeddings"][1:]
+                    store["values"].pop(0)
@@ -143,9 +143,9 @@ class UnifiedPredictor:
         """
         if self.active_manager is None:
             raise ValueError("No model loaded")
-        
-        features_array = np.array(features_list)
-        
+
+        features_array = np.asarray(features_list, dtype=np.float32)
+
         if self.model_type == "sklearn":
             model = self.sklearn_manager.get_model()
             predictions = model.predict(features_array)
@@ -3,8 +3,11 @@ AutoOps Model Service - Telemetry and Metrics
 Telemetry collection and metrics utilities.
 """
 
+import os
+import queue
 import time
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -156,8 +159,23 @@ class TelemetryCollector:
 telemetry_collector = TelemetryCollector()
 
 
+_log_listener: Optional[QueueListener] = None
+
+
 def setup_telemetry():
-    """Setup telemetry collection."""
+    """Setup telemetry collection and non-blocking logging."""
+    global _log_listener
+    
+    # Route records through an in-memory queue so emitting a log line
+    # never blocks the event loop thread on a stdout flush
+    if _log_listener is None:
+        log_queue = queue.Queue(-1)
+        root_logger = logging.getLogger()
+        root_logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+        root_logger.handlers = [QueueHandler(log_queue)]
+        _log_listener = QueueListener(log_queue, logging.StreamHandler())
+        _log_listener.start()
+    
     logger.info("Setting up telemetry collection")
     telemetry_collector.update_uptime()
 
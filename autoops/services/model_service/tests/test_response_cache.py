@@ -0,0 +1,115 @@
+"""
+AutoOps Model Service - Response Cache Tests
+Unit tests for the two-tier LLM response cache.
+"""
+
+import numpy as np
+
+# Import model classes
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.model.response_cache import ResponseCache, make_cache_key
+
+
+def _fake_embed(table):
+    """Build an _embed stand-in backed by a prompt -> vector table."""
+    def embed(prompt):
+        vector = np.asarray(table[prompt], dtype=np.float64)
+        return vector / np.linalg.norm(vector)
+    return embed
+
+
+class TestMakeCacheKey:
+    """Test cache key construction."""
+
+    def test_key_is_stable_across_prompt_whitespace_and_case(self):
+        """Equivalent prompts hash to the same key."""
+        a = make_cache_key("gemini", "model", "Hello World", temperature=0.2)
+        b = make_cache_key("gemini", "model", "  hello world ", temperature=0.2)
+        assert a == b
+
+    def test_params_change_the_key(self):
+        """Different sampling parameters must not share a key."""
+        a = make_cache_key("gemini", "model", "hello", temperature=0.2)
+        b = make_cache_key("gemini", "model", "hello", temperature=0.3)
+        assert a != b
+
+    def test_provider_and_model_change_the_key(self):
+        """Different providers/models must not share a key."""
+        a = make_cache_key("gemini", "model-a", "hello")
+        b = make_cache_key("gemini", "model-b", "hello")
+        c = make_cache_key("huggingface", "model-a", "hello")
+        assert len({a, b, c}) == 3
+
+
+class TestResponseCacheExactTier:
+    """Test the exact-key LRU store."""
+
+    def test_exact_hit_and_miss(self):
+        """Stored keys hit; unknown keys miss."""
+        cache = ResponseCache()
+        cache.set("key-1", "value-1")
+
+        assert cache.get("key-1") == "value-1"
+        assert cache.get("key-2") is None
+        assert cache.stats["exact_hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Least-recently-used entries fall out at maxsize."""
+        cache = ResponseCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # refresh "a" so "b" is the eviction candidate
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+
+class TestResponseCacheSemanticTier:
+    """Test the embedding-based tier with a stubbed embedder."""
+
+    def test_paraphrase_hits_within_scope(self):
+        """A near-identical prompt matches the stored entry."""
+        cache = ResponseCache(semantic_threshold=0.92)
+        cache._embed = _fake_embed({
+            "what is ai": [1.0, 0.0],
+            "what is ai?": [0.999, 0.01],
+        })
+
+        cache.set("key-1", "answer", prompt="what is ai", scope="qa")
+        result = cache.get("other-key", prompt="what is ai?", scope="qa")
+
+        assert result == "answer"
+        assert cache.stats["semantic_hits"] == 1
+
+    def test_no_match_across_scopes(self):
+        """The same text must not answer a different operation or task."""
+        cache = ResponseCache(semantic_threshold=0.92)
+        cache._embed = _fake_embed({"great product": [1.0, 0.0]})
+
+        cache.set(
+            "key-1", {"task": "sentiment", "result": "positive"},
+            prompt="great product", scope="analyze:sentiment"
+        )
+
+        assert cache.get("key-2", prompt="great product", scope="analyze:summary") is None
+        assert cache.get("key-3", prompt="great product", scope="chat") is None
+
+    def test_dissimilar_prompt_misses(self):
+        """Prompts below the similarity threshold do not match."""
+        cache = ResponseCache(semantic_threshold=0.92)
+        cache._embed = _fake_embed({
+            "what is ai": [1.0, 0.0],
+            "how do i bake bread": [0.0, 1.0],
+        })
+
+        cache.set("key-1", "answer", prompt="what is ai", scope="qa")
+
+        assert cache.get("key-2", prompt="how do i bake bread", scope="qa") is None
+        assert cache.stats["semantic_hits"] == 0